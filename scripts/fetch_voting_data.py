@@ -7,107 +7,279 @@ Data Source: https://opendata.tweedekamer.nl
 API: https://gegevensmagazijn.tweedekamer.nl/OData/v4/2.0/
 """
 
-import requests
+import asyncio
+import contextlib
+import logging
+import aiohttp
+import ijson
+import orjson
 import pandas as pd
-import time
-import json
+import os
 import urllib.parse
+from aiohttp_client_cache import CachedSession, SQLiteBackend
+from aiohttp_client_cache.cache_control import DO_NOT_CACHE
+from tqdm.auto import tqdm
+from tqdm.contrib.logging import logging_redirect_tqdm
+
+logger = logging.getLogger(__name__)
 
 BASE_URL = "https://gegevensmagazijn.tweedekamer.nl/OData/v4/2.0"
-BATCH_SIZE = 250  # API maximum limit
+BATCH_SIZE = 250  # Fallback page size if the probe fails
+PROBE_SIZE = 5000  # $top used to discover the server's real page cap
+MAX_CONCURRENCY = 8  # Max in-flight requests across all fetchers
+VOTING_COLUMNS = ["Besluit_Id", "ActorFractie", "Soort", "GewijzigdOp"]  # Requested via $select
+HEADERS = {
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip, deflate",
+    "User-Agent": "tweede-kamer-analysis/1.0"
+}
+MAX_RETRIES = 5
+BACKOFF_FACTOR = 0.3  # Retry delays: 0.3s, 0.6s, 1.2s, ...
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+CACHE_NAME = "tk_cache"  # SQLite response cache, reused across reruns
+CACHE_EXPIRE_S = 24 * 3600
+
+# Analysis periods (UTC, bounds inclusive)
+PRE_START = pd.Timestamp("2022-11-22", tz='UTC')
+PRE_END = pd.Timestamp("2023-11-21 23:59:59", tz='UTC')
+POST_START = pd.Timestamp("2024-07-05", tz='UTC')
+POST_END = pd.Timestamp("2025-07-04 23:59:59", tz='UTC')
 
-def fetch_paginated_data(endpoint, filter_query=None):
-    """Fetch all data from API with pagination."""
-    import urllib.parse
-    
-    all_data = []
-    skip = 0
-    batch_num = 1
-    total_records = 0
-    
-    while True:
-        if filter_query:
-            url = f"{BASE_URL}/{endpoint}?$filter={urllib.parse.quote(filter_query)}&$top={BATCH_SIZE}&$skip={skip}"
+@contextlib.asynccontextmanager
+async def open_page(session, semaphore, url, label, **get_kwargs):
+    """
+    GET a page and yield the response once it succeeded, holding a semaphore slot.
+    Extra keyword arguments are passed on to session.get.
+    Connection errors and RETRY_STATUSES are retried with exponential backoff,
+    honouring the server's Retry-After header; other HTTP errors are raised.
+    The slot is released while backing off, so one struggling request does
+    not block the other fetchers.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        delay = BACKOFF_FACTOR * 2 ** attempt
+        await semaphore.acquire()
+        try:
+            response = await session.get(url, **get_kwargs)
+        except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+            semaphore.release()
+            if attempt == MAX_RETRIES:
+                raise
+            reason = repr(e)
+        except BaseException:
+            semaphore.release()
+            raise
         else:
-            url = f"{BASE_URL}/{endpoint}?$top={BATCH_SIZE}&$skip={skip}"
+            if response.status not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                break
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = int(retry_after)
+            reason = f"HTTP {response.status}"
+            response.release()
+            semaphore.release()
+        logger.warning(f"[{label}] {reason}, retrying in {delay:.1f}s ({attempt + 1}/{MAX_RETRIES})")
+        await asyncio.sleep(delay)
+    
+    try:
+        response.raise_for_status()
+        yield response
+    finally:
+        response.release()
+        semaphore.release()
+
+
+async def fetch_page(session, semaphore, url, label, pause_s=0.1):
+    """
+    Fetch a single page of results and return the decoded payload.
+    Unlike streamed pages, a buffered body that fails mid-read is simply
+    requested again, with the same backoff as open_page.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        async with open_page(session, semaphore, url, label) as response:
+            try:
+                body = await response.read()
+            except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                reason = repr(e)
+            else:
+                # Pages served from the local cache don't need the courtesy pause
+                if not getattr(response, "from_cache", False):
+                    await asyncio.sleep(pause_s)
+                return orjson.loads(body)
+        delay = BACKOFF_FACTOR * 2 ** attempt
+        logger.warning(f"[{label}] {reason} while reading body, retrying in {delay:.1f}s "
+                       f"({attempt + 1}/{MAX_RETRIES})")
+        await asyncio.sleep(delay)
+
+
+async def probe_page_size(session, semaphore):
+    """Request PROBE_SIZE records once and return how many the server actually serves per page."""
+    url = f"{BASE_URL}/Stemming?$select=Id&$top={PROBE_SIZE}&$skip=0"
+    try:
+        payload = await fetch_page(session, semaphore, url, "probe", pause_s=0)
+    except aiohttp.ClientResponseError as e:
+        logger.warning(f"[probe] Page size probe rejected ({e.status}), using {BATCH_SIZE}")
+        return BATCH_SIZE
+    if payload.get("value"):
+        return len(payload["value"])
+    return BATCH_SIZE
+
+
+async def fetch_paginated_data(session, semaphore, endpoint, filter_query=None, select=None,
+                               dedupe_cols=None, page_size=BATCH_SIZE, label=None, pause_s=0.1):
+    """
+    Fetch all data from API with pagination.
+    The first request asks the server for $count; all remaining $skip
+    offsets are then requested in parallel and returned in skip order.
+    The $skip step is the size of the first page, which is what the server
+    actually serves for this query.
+    If dedupe_cols is given, rows repeating an earlier key are dropped as
+    each page arrives, so only unique rows are kept in memory.
+    """
+    label = label or endpoint
+    
+    # $orderby keeps $skip pages stable across parallel requests
+    query = "$orderby=Id"
+    if filter_query:
+        query += f"&$filter={urllib.parse.quote(filter_query)}"
+    if select:
+        query += f"&$select={urllib.parse.quote(select)}"
+    
+    def url_for(skip):
+        return f"{BASE_URL}/{endpoint}?{query}&$top={page_size}&$skip={skip}"
+    
+    first = await fetch_page(session, semaphore, f"{url_for(0)}&$count=true", label, pause_s)
+    if not first.get("value"):
+        return pd.DataFrame()
+    
+    seen = set()
+    
+    def keep_unique(value):
+        if not dedupe_cols:
+            return value
+        unique = []
+        for row in value:
+            key = tuple(row.get(c) for c in dedupe_cols)
+            if key in seen:
+                continue
+            seen.add(key)
+            unique.append(row)
+        return unique
+    
+    # One list of (unique) rows per skip index, kept in skip order
+    pages = [keep_unique(first["value"])]
+    total = first.get("@odata.count")
+    step = len(first["value"])
+    fetched = step
+    
+    with tqdm(total=total, unit="rec", desc=label) as pbar:
+        pbar.update(step)
         
-        # Show progress every 10 batches or on first/last batch
-        if batch_num == 1 or batch_num % 10 == 0:
-            print(f"Batch {batch_num} (skip={skip:,})...", end=" ", flush=True)
+        async def fetch_counted(skip):
+            nonlocal fetched
+            payload = await fetch_page(session, semaphore, url_for(skip), label, pause_s)
+            value = payload.get("value", [])
+            fetched += len(value)
+            pbar.update(len(value))
+            return len(value), keep_unique(value)
         
-        try:
-            response = requests.get(url, headers={"Accept": "application/json"})
-            response.raise_for_status()
-            data = response.json()
-            
-            if "value" not in data or len(data["value"]) == 0:
-                if batch_num % 10 != 0:
-                    print(f"\nBatch {batch_num}: Done.")
-                else:
-                    print("Done.")
-                break
-            
-            batch_df = pd.DataFrame(data["value"])
-            all_data.append(batch_df)
-            total_records += len(batch_df)
-            
-            if batch_num == 1 or batch_num % 10 == 0:
-                print(f"{len(batch_df)} records (total: {total_records:,})")
-            
-            if len(batch_df) < BATCH_SIZE:
-                if batch_num % 10 != 0:
-                    print(f"\nBatch {batch_num}: {len(batch_df)} records (total: {total_records:,})")
-                break
-            
-            skip += BATCH_SIZE
-            batch_num += 1
-            time.sleep(0.1)  # Reduced from 0.5 to 0.1 seconds
-            
-        except Exception as e:
-            print(f"\nError at batch {batch_num}: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"Response: {e.response.text[:200]}")
-            break
-    
-    if all_data:
-        result = pd.concat(all_data, ignore_index=True)
-        print(f"\nTotal fetched: {len(result):,} records")
-        return result
-    return pd.DataFrame()
+        if total is not None:
+            offsets = range(step, total, step)
+            results = await asyncio.gather(*(fetch_counted(skip) for skip in offsets))
+            pages.extend(rows for _, rows in results)
+        else:
+            # Server did not report a count: walk the pages one by one
+            skip = step
+            page_len = step
+            while page_len == step:
+                page_len, rows = await fetch_counted(skip)
+                if not page_len:
+                    break
+                pages.append(rows)
+                skip += step
+    
+    if total is not None and fetched != total:
+        logger.warning(f"[{label}] Fetched {fetched:,} records but the server reported {total:,}")
+    
+    # Build the frame once from the raw records instead of per batch
+    all_rows = [row for rows in pages for row in rows]
+    result = pd.DataFrame.from_records(all_rows)
+    logger.info(f"[{label}] Total fetched: {len(result):,} records")
+    return result
 
 
 def process_voting_data(df):
-    """Clean voting data: keep only Voor/Tegen, select essential columns."""
+    """Clean deduplicated voting data: keep only Voor/Tegen, select essential columns."""
     if df.empty:
         return df
     
     # Filter Voor/Tegen votes
-    if "Soort" in df.columns:
-        df = df[df["Soort"].isin(["Voor", "Tegen"])]
+    df = df[df["Soort"].isin(["Voor", "Tegen"])]
     
-    # Select essential columns
-    cols = ["Besluit_Id", "ActorFractie", "Soort", "GewijzigdOp"]
-    available_cols = [c for c in cols if c in df.columns]
+    # $select guarantees the essential columns are present
+    df = df[VOTING_COLUMNS]
     
-    if available_cols:
-        df = df[available_cols].drop_duplicates()
+    # Few distinct values: store as categoricals instead of Python objects
+    df = df.astype({"ActorFractie": "category", "Soort": "category"})
     
     return df
 
 
-def fetch_coauthoring_data(date_from, date_to, pause_s=0.2):
+def save_voting_data(df, csv_path):
+    """Write voting data as CSV (read by the R analyses) plus a Parquet copy."""
+    df.to_csv(csv_path, index=False)
+    df.to_parquet(os.path.splitext(csv_path)[0] + ".parquet", engine="pyarrow", compression="zstd", index=False)
+
+
+def filter_by_date(df, start, end, col="GewijzigdOp"):
+    """Keep rows whose timestamp column falls within [start, end]."""
+    return df[df[col].between(start, end, inclusive="both")]
+
+
+async def fetch_voting_data(session, semaphore, start_dt, end_dt, page_size, label):
+    """Fetch, clean and date-filter Stemming records for one period."""
+    filter_query = (f"GewijzigdOp ge {start_dt:%Y-%m-%dT%H:%M:%SZ} "
+                    f"and GewijzigdOp le {end_dt:%Y-%m-%dT%H:%M:%SZ}")
+    data = await fetch_paginated_data(session, semaphore, "Stemming", filter_query,
+                                      select=",".join(VOTING_COLUMNS), dedupe_cols=VOTING_COLUMNS,
+                                      page_size=page_size, label=label)
+    
+    # Don't fall back to downloading the whole table: an empty result means the
+    # server-side filter failed
+    if data.empty:
+        raise RuntimeError(f"[{label}] Server-side date filter returned no Stemming records: {filter_query}")
+    
+    processed = process_voting_data(data)
+    processed["GewijzigdOp"] = pd.to_datetime(processed["GewijzigdOp"], format='ISO8601', errors='coerce', utc=True, cache=True)
+    # Single-pass guard in case the server ignored the filter
+    return filter_by_date(processed, start_dt, end_dt)
+
+
+async def fetch_coauthoring_data(session, semaphore, date_from, date_to, out, page_size=BATCH_SIZE, label=None):
     """
     Fetch co-authoring data (motions with co-signers) from Document endpoint.
     Uses @odata.nextLink for pagination (more reliable than $skip).
+    Each page is stream-parsed with ijson and documents are written to `out`
+    as a JSON array as they are decoded, so only one document is held in
+    memory at a time.
     
     Args:
+        session: Shared aiohttp.ClientSession
+        semaphore: asyncio.Semaphore bounding concurrent requests
         date_from: Start date (YYYY-MM-DD)
         date_to: End date (YYYY-MM-DD)
-        pause_s: Pause between requests in seconds
+        out: Binary file handle the JSON array is written to
+        page_size: Requested $top; the server may serve fewer per page,
+            paging continues via @odata.nextLink either way
+        label: Prefix for progress output
     
     Returns:
-        List of document items with expanded DocumentActor information
+        Dict with the number of documents written, unique motions and
+        total actor-document relationships
     """
+    label = label or f"Document {date_from}..{date_to}"
+    
     # Build filter query
     filter_query = (
         "Verwijderd eq false "
@@ -127,87 +299,114 @@ def fetch_coauthoring_data(date_from, date_to, pause_s=0.2):
         "$filter": filter_query,
         "$expand": expand_query,
         "$select": select_query,
-        "$top": "250"
+        "$top": str(page_size),
+        "$count": "true"
     }
     
-    # Build query string
-    query_parts = []
-    for key, value in params.items():
-        query_parts.append(f"{key}={urllib.parse.quote(value)}")
-    query_string = "&".join(query_parts)
-    
+    # Build the query string once; later pages come from @odata.nextLink
+    query_string = "&".join(f"{key}={urllib.parse.quote(value)}" for key, value in params.items())
     url = f"{BASE_URL}/Document?{query_string}"
     
-    headers = {
-        "Accept": "application/json",
-        "User-Agent": "tweede-kamer-analysis/1.0"
-    }
-    
-    all_items = []
     seen = 0
-    batch_num = 1
-    skip = 0
+    unique_ids = set()
+    total_actors = 0
     
-    while True:
-        # Show progress every 10 batches or on first/last batch
-        if batch_num == 1 or batch_num % 10 == 0:
-            print(f"Batch {batch_num} (skip={skip:,})...", end=" ", flush=True)
-        
-        try:
-            response = requests.get(url, headers=headers, timeout=60)
-            response.raise_for_status()
-            payload = response.json()
+    with tqdm(unit="doc", desc=label) as pbar:
+        while True:
+            next_link = None
+            builder = None
             
-            value = payload.get("value", [])
-            all_items.extend(value)
-            seen += len(value)
-            
-            next_link = payload.get("@odata.nextLink")
+            # Bypass the response cache: caching reads the whole body into memory
+            # before it is handed over, which would defeat the streaming parse
+            async with open_page(session, semaphore, url, label, expire_after=DO_NOT_CACHE) as response:
+                async for prefix, event, val in ijson.parse_async(response.content, use_float=True):
+                    if prefix == "@odata.count":
+                        pbar.total = val
+                        pbar.refresh()
+                        continue
+                    if prefix == "@odata.nextLink":
+                        next_link = val
+                        continue
+                    if not prefix.startswith("value.item"):
+                        continue
+                    
+                    # Rebuild one document at a time from the parser events
+                    if prefix == "value.item" and event == "start_map":
+                        builder = ijson.ObjectBuilder()
+                    builder.event(event, val)
+                    if prefix == "value.item" and event == "end_map":
+                        item = builder.value
+                        out.write(b",\n" if seen else b"[\n")
+                        out.write(orjson.dumps(item))
+                        seen += 1
+                        pbar.update(1)
+                        if item.get("Id"):
+                            unique_ids.add(item["Id"])
+                        total_actors += len(item.get("DocumentActor", []))
             
-            if batch_num == 1 or batch_num % 10 == 0:
-                print(f"{len(value):4d} records (total: {seen:6d})")
-            
-            # Check if we got fewer records than requested (last batch)
-            if len(value) < 250:
-                if batch_num % 10 != 0:
-                    print(f"\nBatch {batch_num}: {len(value):4d} records (total: {seen:6d})")
-                else:
-                    print("Done.")
+            # The server omits the next link on the last page
+            if not next_link:
                 break
-            
-            # If there's a next link, use it (preferred method)
-            if next_link:
-                url = next_link
-            else:
-                # Fallback: use $skip if no next link but we got a full batch
-                skip += 250
-                # Rebuild URL with new skip value
-                query_parts = []
-                for key, val in params.items():
-                    if key != "$skip":  # Don't include skip in params, we'll add it separately
-                        query_parts.append(f"{key}={urllib.parse.quote(val)}")
-                query_parts.append(f"$skip={skip}")
-                query_string = "&".join(query_parts)
-                url = f"{BASE_URL}/Document?{query_string}"
-            
-            batch_num += 1
-            time.sleep(pause_s)
-            
-        except Exception as e:
-            print(f"\nError at batch {batch_num}: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"Response: {e.response.text[:200]}")
-            break
-    
-    print(f"\nTotal fetched: {len(all_items):,} documents")
-    return all_items
+            url = next_link
+    
+    out.write(b"\n]\n" if seen else b"[]\n")
+    logger.info(f"[{label}] Total fetched: {seen:,} documents")
+    return {"documents": seen, "unique_docs": len(unique_ids), "total_actors": total_actors}
 
 
-def main():
+async def main():
     print("=" * 80)
     print("FETCHING DATA FROM TWEEDE KAMER API")
     print("=" * 80)
     
+    # The four fetches are independent: run them concurrently over one
+    # pooled session, bounded by a shared semaphore
+    print("\nFetching VOTING and CO-AUTHORING DATA for both periods...")
+    print("-" * 80)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    # Every request goes to one host: give each semaphore holder a connection
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENCY, limit_per_host=MAX_CONCURRENCY)
+    # Per-read timeout like requests' timeout=60; no cap on the whole download
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=60)
+    cache = SQLiteBackend(CACHE_NAME, expire_after=CACHE_EXPIRE_S, allowed_methods=("GET",))
+    # Co-authoring documents are streamed to a partial file and only moved into
+    # place once the fetch produced data
+    coauth_pre_file = "data/coauthoring_data_2023_preelection.json"
+    coauth_post_file = "data/coauthoring_data_2024_postformation.json"
+    part_files = [coauth_pre_file + ".part", coauth_post_file + ".part"]
+    try:
+        with open(part_files[0], 'wb') as coauth_pre_out, open(part_files[1], 'wb') as coauth_post_out:
+            async with CachedSession(cache=cache, connector=connector, timeout=timeout, headers=HEADERS) as session:
+                page_size = await probe_page_size(session, semaphore)
+                print(f"Server page size: {page_size} records per request")
+                with logging_redirect_tqdm():
+                    tasks = [
+                        asyncio.ensure_future(fetch_voting_data(
+                            session, semaphore, PRE_START, PRE_END, page_size, "Stemming pre")),
+                        asyncio.ensure_future(fetch_voting_data(
+                            session, semaphore, POST_START, POST_END, page_size, "Stemming post")),
+                        asyncio.ensure_future(fetch_coauthoring_data(
+                            session, semaphore, f"{PRE_START:%Y-%m-%d}", f"{PRE_END:%Y-%m-%d}",
+                            coauth_pre_out, page_size, label="Document pre")),
+                        asyncio.ensure_future(fetch_coauthoring_data(
+                            session, semaphore, f"{POST_START:%Y-%m-%d}", f"{POST_END:%Y-%m-%d}",
+                            coauth_post_out, page_size, label="Document post")),
+                    ]
+                    try:
+                        results = await asyncio.gather(*tasks)
+                    except BaseException:
+                        # Stop the sibling fetches before their file handles are closed
+                        for task in tasks:
+                            task.cancel()
+                        await asyncio.gather(*tasks, return_exceptions=True)
+                        raise
+    except BaseException:
+        for path in part_files:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+        raise
+    pre_processed, post_processed, coauth_pre_stats, coauth_post_stats = results
+    
     # ============================================================================
     # PRE-ELECTION PERIOD: Nov 22, 2022 - Nov 21, 2023
     # ============================================================================
@@ -216,62 +415,21 @@ def main():
     print("PRE-ELECTION PERIOD: Nov 22, 2022 - Nov 21, 2023")
     print("=" * 80)
     
-    # Fetch voting data
-    print("\nFetching VOTING DATA...")
-    print("-" * 80)
-    pre_filter = "GewijzigdOp ge 2022-11-22T00:00:00Z and GewijzigdOp le 2023-11-21T23:59:59Z"
-    pre_data = fetch_paginated_data("Stemming", pre_filter)
-    
-    # If filter failed, fetch all and filter in Python
-    if pre_data.empty:
-        print("Date filter failed, fetching all data and filtering in Python...")
-        all_data = fetch_paginated_data("Stemming")
-        if not all_data.empty:
-            processed = process_voting_data(all_data)
-            if "GewijzigdOp" in processed.columns:
-                processed["GewijzigdOp"] = pd.to_datetime(processed["GewijzigdOp"], format='ISO8601', errors='coerce', utc=True)
-                pre_start_dt = pd.Timestamp("2022-11-22", tz='UTC')
-                pre_end_dt = pd.Timestamp("2023-11-21 23:59:59", tz='UTC')
-                pre_data = processed[
-                    (processed["GewijzigdOp"] >= pre_start_dt) & 
-                    (processed["GewijzigdOp"] <= pre_end_dt)
-                ]
-    
-    if not pre_data.empty:
-        pre_processed = process_voting_data(pre_data)
-        if "GewijzigdOp" in pre_processed.columns:
-            pre_processed["GewijzigdOp"] = pd.to_datetime(pre_processed["GewijzigdOp"], format='ISO8601', errors='coerce', utc=True)
-            pre_start_dt = pd.Timestamp("2022-11-22", tz='UTC')
-            pre_end_dt = pd.Timestamp("2023-11-21 23:59:59", tz='UTC')
-            pre_processed = pre_processed[
-                (pre_processed["GewijzigdOp"] >= pre_start_dt) & 
-                (pre_processed["GewijzigdOp"] <= pre_end_dt)
-            ]
-        
-        pre_processed.to_csv("data/voting_data_2023_preelection.csv", index=False)
+    if not pre_processed.empty:
+        save_voting_data(pre_processed, "data/voting_data_2023_preelection.csv")
         print(f"✓ Saved: {len(pre_processed):,} votes, "
               f"{pre_processed['Besluit_Id'].nunique():,} motions, "
               f"{pre_processed['ActorFractie'].nunique()} parties")
     else:
         print("✗ No voting data found for pre-election period")
     
-    # Fetch co-authoring data
-    print("\nFetching CO-AUTHORING DATA...")
-    print("-" * 80)
-    coauth_pre_items = fetch_coauthoring_data("2022-11-22", "2023-11-21")
-    
-    if coauth_pre_items:
-        output_file = "data/coauthoring_data_2023_preelection.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(coauth_pre_items, f, ensure_ascii=False, indent=2, default=str)
-        
-        unique_docs = len(set(item.get("Id") for item in coauth_pre_items if item.get("Id")))
-        total_actors = sum(len(item.get("DocumentActor", [])) for item in coauth_pre_items)
-        
-        print(f"✓ Saved: {len(coauth_pre_items):,} documents, "
-              f"{unique_docs:,} unique motions, "
-              f"{total_actors:,} total actor-document relationships")
+    if coauth_pre_stats["documents"]:
+        os.replace(coauth_pre_file + ".part", coauth_pre_file)
+        print(f"✓ Saved: {coauth_pre_stats['documents']:,} documents, "
+              f"{coauth_pre_stats['unique_docs']:,} unique motions, "
+              f"{coauth_pre_stats['total_actors']:,} total actor-document relationships")
     else:
+        os.remove(coauth_pre_file + ".part")
         print("✗ No co-authoring data found for pre-election period")
     
     # ============================================================================
@@ -282,62 +440,21 @@ def main():
     print("POST-FORMATION PERIOD: Jul 5, 2024 - Jul 4, 2025")
     print("=" * 80)
     
-    # Fetch voting data
-    print("\nFetching VOTING DATA...")
-    print("-" * 80)
-    post_filter = "GewijzigdOp ge 2024-07-05T00:00:00Z and GewijzigdOp le 2025-07-04T23:59:59Z"
-    post_data = fetch_paginated_data("Stemming", post_filter)
-    
-    # If filter failed, fetch all and filter in Python
-    if post_data.empty:
-        print("Date filter failed, fetching all data and filtering in Python...")
-        all_data = fetch_paginated_data("Stemming")
-        if not all_data.empty:
-            processed = process_voting_data(all_data)
-            if "GewijzigdOp" in processed.columns:
-                processed["GewijzigdOp"] = pd.to_datetime(processed["GewijzigdOp"], format='ISO8601', errors='coerce', utc=True)
-                post_start_dt = pd.Timestamp("2024-07-05", tz='UTC')
-                post_end_dt = pd.Timestamp("2025-07-04 23:59:59", tz='UTC')
-                post_data = processed[
-                    (processed["GewijzigdOp"] >= post_start_dt) & 
-                    (processed["GewijzigdOp"] <= post_end_dt)
-                ]
-    
-    if not post_data.empty:
-        post_processed = process_voting_data(post_data)
-        if "GewijzigdOp" in post_processed.columns:
-            post_processed["GewijzigdOp"] = pd.to_datetime(post_processed["GewijzigdOp"], format='ISO8601', errors='coerce', utc=True)
-            post_start_dt = pd.Timestamp("2024-07-05", tz='UTC')
-            post_end_dt = pd.Timestamp("2025-07-04 23:59:59", tz='UTC')
-            post_processed = post_processed[
-                (post_processed["GewijzigdOp"] >= post_start_dt) & 
-                (post_processed["GewijzigdOp"] <= post_end_dt)
-            ]
-        
-        post_processed.to_csv("data/voting_data_clean.csv", index=False)
+    if not post_processed.empty:
+        save_voting_data(post_processed, "data/voting_data_clean.csv")
         print(f"✓ Saved: {len(post_processed):,} votes, "
               f"{post_processed['Besluit_Id'].nunique():,} motions, "
               f"{post_processed['ActorFractie'].nunique()} parties")
     else:
         print("✗ No voting data found for post-formation period")
     
-    # Fetch co-authoring data
-    print("\nFetching CO-AUTHORING DATA...")
-    print("-" * 80)
-    coauth_post_items = fetch_coauthoring_data("2024-07-05", "2025-07-04")
-    
-    if coauth_post_items:
-        output_file = "data/coauthoring_data_2024_postformation.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(coauth_post_items, f, ensure_ascii=False, indent=2, default=str)
-        
-        unique_docs = len(set(item.get("Id") for item in coauth_post_items if item.get("Id")))
-        total_actors = sum(len(item.get("DocumentActor", [])) for item in coauth_post_items)
-        
-        print(f"✓ Saved: {len(coauth_post_items):,} documents, "
-              f"{unique_docs:,} unique motions, "
-              f"{total_actors:,} total actor-document relationships")
+    if coauth_post_stats["documents"]:
+        os.replace(coauth_post_file + ".part", coauth_post_file)
+        print(f"✓ Saved: {coauth_post_stats['documents']:,} documents, "
+              f"{coauth_post_stats['unique_docs']:,} unique motions, "
+              f"{coauth_post_stats['total_actors']:,} total actor-document relationships")
     else:
+        os.remove(coauth_post_file + ".part")
         print("✗ No co-authoring data found for post-formation period")
     
     print("\n" + "=" * 80)
@@ -346,5 +463,5 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
-
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    asyncio.run(main())